@@ -5,28 +5,62 @@ This script parses a USB Power Delivery specification PDF, extracts the
 Table of Contents (ToC) and section content, and generates structured JSONL
 files and a validation report.
 """
+import csv
+import hashlib
 import json
+import mmap
 import os
+import pickle
 import re
+import tempfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import fitz  # PyMuPDF
-import pandas as pd
+
+try:
+    import pypdfium2 as pdfium
+    _PDFIUM_AVAILABLE = True
+except ImportError:  # Fall back to PyMuPDF text extraction
+    _PDFIUM_AVAILABLE = False
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:  # Fall back to the standard library encoder
+    _ORJSON_AVAILABLE = False
+
+try:
+    import hyperscan
+    _HYPERSCAN_AVAILABLE = True
+except ImportError:  # Fall back to scanning every line in Python
+    _HYPERSCAN_AVAILABLE = False
 
 # --- CONFIGURATION ---
 PDF_PATH = "USB_PD_R3_2 V1.1 2024-10.pdf"
 OUTPUT_DIR = "output_fixed"
+JSONL_BATCH_SIZE = 1000  # Records encoded per write when saving JSONL
+PAGE_CACHE_VERSION = 1  # Bump whenever _extract_range output changes
+COMPARISON_COLUMNS = ["section_id", "title_toc", "page_toc", "title_parsed", "page_parsed"]
 
 # Precompiled regex patterns for efficiency
-TOC_ENTRY_PATTERN = re.compile(
-    r"^(?P<section_id>(\d+(\.\d+)*)|([A-Za-z][\w\s]*))\s+"
-    r"(?P<title>[^\.]{3,})\s+"
-    r"(?P<page>\d+)\s*$"
-)
+SECTION_NUMBER_PATTERN = re.compile(r"\d+(\.\d+)*")
+WORD_PREFIX_PATTERN = re.compile(r"[\w\s]*")
 
 FIGURE_TABLE_PATTERN = re.compile(r"\b(Figure|Table)\s+\d+", re.IGNORECASE)
 
+# Hyperscan prefilter for lines ending in a page number, the only possible TOC lines
+TOC_CANDIDATE_EXPRESSION = rb"\s\d+[^\S\n]*$"
+# Line breaks other than "\n", whitespace that str.isspace() and Unicode disagree
+# on, lone surrogates (not valid UTF-8) and supplementary-plane characters (whose
+# digits hyperscan's Unicode tables may not know) all force the plain line scan
+PREFILTER_UNSAFE_PATTERN = re.compile(
+    r"[\r\x0b\x0c\x1c-\x1f\x85\u2028\u2029\ud800-\udfff\U00010000-\U0010ffff]"
+)
+
 # --- CORE FUNCTIONS ---
 
 def extract_text_from_pdf(pdf_path: str) -> List[str]:
@@ -34,58 +68,213 @@ def extract_text_from_pdf(pdf_path: str) -> List[str]:
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"PDF file not found at: {pdf_path}")
     
+    # Reuse previously extracted text if this exact PDF has been seen before
+    cache_path = _page_cache_path(pdf_path)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if isinstance(cached, list) and all(isinstance(page, str) for page in cached):
+                return cached
+        except Exception:
+            pass  # Corrupt, foreign or unreadable cache; re-extract below
+    
+    text_pages = _extract_all_pages(pdf_path)
+    
+    # Write to a temp file and rename, so an interrupted run never leaves a partial cache
+    tmp_path = None
     try:
-        with fitz.open(pdf_path) as doc:
-            return [page.get_text("text") for page in doc]
+        fd, tmp_path = tempfile.mkstemp(dir=OUTPUT_DIR, prefix=".pages_", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(text_pages, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write page cache: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return text_pages
+
+def _page_cache_path(pdf_path: str) -> str:
+    """Return the page-text cache path keyed by the PDF content hash."""
+    digest = hashlib.sha1()
+    with open(pdf_path, "rb") as f:
+        # Hash straight from the page cache instead of copying the file into Python
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+    backend = "pdfium" if _PDFIUM_AVAILABLE else "fitz"
+    return os.path.join(
+        OUTPUT_DIR, 
+        f".pages_v{PAGE_CACHE_VERSION}_{backend}_{digest.hexdigest()}.pkl"
+    )
+
+def _extract_all_pages(pdf_path: str) -> List[str]:
+    """Extract text from every page, splitting the work across processes."""
+    try:
+        page_count = _get_page_count(pdf_path)
+        
+        # Split the page range into contiguous chunks, one per worker process
+        workers = max(1, min(os.cpu_count() or 1, page_count))
+        chunk_size = -(-page_count // workers)
+        ranges = [
+            (start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
+        ]
+        
+        if len(ranges) <= 1:
+            return _extract_range(pdf_path, 0, page_count)
+        
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_range, pdf_path, start, end)
+                for start, end in ranges
+            ]
+            return [text for future in futures for text in future.result()]
     except Exception as e:
         raise IOError(f"Error opening or reading PDF file: {e}") from e
 
-def find_toc_content(text_pages: List[str]) -> List[str]:
-    """Find Table of Contents content by scanning for numbered section formats."""
+def _get_page_count(pdf_path: str) -> int:
+    """Return the number of pages in the PDF."""
+    if _PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+def _extract_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Worker helper that extracts text for pages in the range [start, end)."""
+    if _PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return [
+                pdf[i].get_textpage().get_text_range().replace("\r\n", "\n")
+                for i in range(start, end)
+            ]
+        finally:
+            pdf.close()
+    
+    with fitz.open(pdf_path) as doc:
+        return [doc[i].get_text("text") for i in range(start, end)]
+
+def build_toc_entries(text_pages: List[str], doc_title: str) -> List[Dict[str, Any]]:
+    """Scan all pages for TOC entry lines and parse them in a single pass."""
     print("🔍 Scanning for Table of Contents content...")
-    toc_lines = []
+    toc_entries = []
     
     # Scan through all pages looking for numbered section formats
     for i, text in enumerate(text_pages):
-        # Look for lines that match our TOC entry pattern
-        for line in text.split('\n'):
-            if TOC_ENTRY_PATTERN.match(line.strip()):
-                toc_lines.append((i, line.strip()))
+        for line in _iter_toc_candidate_lines(text):
+            parsed = _parse_toc_line(line)
+            if parsed:
+                # Record the 1-based page the entry was found on
+                toc_entries.append(_toc_entry_from_parts(parsed, i + 1, doc_title))
     
-    if not toc_lines:
+    if not toc_entries:
         raise RuntimeError("Could not find Table of Contents content in the document.")
-        
-    return toc_lines
-
-def parse_toc_entries(toc_lines: List[Tuple[int, str]], doc_title: str) -> List[Dict[str, Any]]:
-    """Parse TOC entries from the found content."""
-    print("⚙️ Parsing Table of Contents...")
-    toc_entries = []
-    
-    for page_num, line in toc_lines:
-        entry = parse_toc_entry(line, doc_title)
-        if entry:
-            entry['page'] = page_num + 1  # Convert to 1-based page numbering
-            toc_entries.append(entry)
     
     print(f"Found {len(toc_entries)} entries in TOC.")
     return toc_entries
 
-def parse_toc_entry(line: str, doc_title: str) -> Optional[Dict[str, Any]]:
-    """Parse a single TOC entry line into structured data."""
-    match = TOC_ENTRY_PATTERN.match(line.strip())
-    if not match:
+def _iter_toc_candidate_lines(text: str) -> Iterator[str]:
+    """Yield the stripped, non-empty lines of a page that may hold a TOC entry."""
+    if not _HYPERSCAN_AVAILABLE or PREFILTER_UNSAFE_PATTERN.search(text):
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if line:
+                yield line
+        return
+    
+    # Let hyperscan find the few lines ending in a page number in one C call
+    data = text.encode("utf-8")
+    match_ends: List[int] = []
+    _toc_candidate_database().scan(
+        data, 
+        match_event_handler=lambda _id, _start, end, _flags, _ctx: match_ends.append(end)
+    )
+    
+    last_start = -1
+    for end in match_ends:
+        start = data.rfind(b"\n", 0, end) + 1
+        if start == last_start:
+            continue  # Several matches can end on the same line
+        last_start = start
+        line_end = data.find(b"\n", end)
+        line = data[start:line_end if line_end != -1 else len(data)].decode("utf-8").strip()
+        if line:
+            yield line
+
+@lru_cache(maxsize=None)
+def _toc_candidate_database() -> Any:
+    """Compile the hyperscan TOC prefilter once per process."""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[TOC_CANDIDATE_EXPRESSION], 
+        ids=[0], 
+        flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP]
+    )
+    return database
+
+def _parse_toc_line(line: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a TOC line into (section_id, title, page) using plain string scans.
+    
+    A TOC line is a dotted section number (or a name starting with an ASCII
+    letter), a title of at least three characters without dots, and a trailing
+    page number. Scanning with string methods avoids regex backtracking on the
+    large majority of lines that are not TOC entries.
+    """
+    parts = line.rsplit(None, 1)
+    if len(parts) != 2 or not parts[1].isdecimal():
         return None
-        
-    section_id = match.group("section_id").strip()
-    title = match.group("title").strip()
-    page = int(match.group("page").strip())
+    
+    page = parts[1]
+    page_start = len(line.rstrip()) - len(page)
+    first_char = line[0]
+    
+    if first_char.isdecimal():
+        # Numbered section: the leading token must be a dotted number
+        split_at = len(line.split(None, 1)[0])
+        if not SECTION_NUMBER_PATTERN.fullmatch(line, 0, split_at):
+            return None
+    elif first_char.isascii() and first_char.isalpha():
+        # Named section: the longest word/space prefix that leaves room for a title
+        if "." in line[:page_start]:
+            return None
+        word_prefix = WORD_PREFIX_PATTERN.match(line)
+        split_at = min(word_prefix.end() if word_prefix else 0, page_start - 5)
+        while split_at > 0 and not line[split_at].isspace():
+            split_at -= 1
+        if split_at <= 0:
+            return None
+    else:
+        return None
+    
+    # Title needs at least 3 non-dot characters, surrounded by whitespace
+    middle = line[split_at:page_start]
+    if len(middle) < 5 or not middle[0].isspace() or "." in middle:
+        return None
+    
+    return line[:split_at].strip(), middle.strip(), page
+
+def _toc_entry_from_parts(
+    parts: Tuple[str, str, str], 
+    page: int, 
+    doc_title: str
+) -> Dict[str, Any]:
+    """Build a structured TOC entry from the fields of a tokenized TOC line."""
+    section_id, title, _ = parts
     
     # Determine hierarchy level and parent ID
-    if re.match(r"^\d+(\.\d+)*$", section_id):
-        parts = section_id.split(".")
-        level = len(parts)
-        parent_id = ".".join(parts[:-1]) if level > 1 else None
+    if SECTION_NUMBER_PATTERN.fullmatch(section_id):
+        id_parts = section_id.split(".")
+        level = len(id_parts)
+        parent_id = ".".join(id_parts[:-1]) if level > 1 else None
     else:
         level = 1
         parent_id = None
@@ -107,11 +296,39 @@ def parse_toc_entry(line: str, doc_title: str) -> Optional[Dict[str, Any]]:
         "level": level,
         "parent_id": parent_id,
         "full_path": full_path,
-        "tags": tags
+        "tags": tags,
+        "_id_upper": section_id.upper()
     }
 
+def _find_section_id(
+    text_pages: List[str], 
+    upper_pages: Dict[int, str], 
+    page_num: int, 
+    section: Dict[str, Any]
+) -> int:
+    """Return the index of the first case-insensitive occurrence of the section ID, or -1."""
+    page_text = text_pages[page_num]
+    section_id = section["section_id"]
+    id_upper = section["_id_upper"]
+    if id_upper == section_id.lower():
+        # Purely numeric IDs (e.g. "6.4.1") have no case to ignore
+        return page_text.find(section_id)
+    
+    # Upper-case each page at most once, and only when a lookup needs it
+    page_text_upper = upper_pages.get(page_num)
+    if page_text_upper is None:
+        page_text_upper = upper_pages[page_num] = page_text.upper()
+    
+    if len(page_text_upper) == len(page_text):
+        return page_text_upper.find(id_upper)
+    
+    # Upper-casing changed the length (e.g. ligatures), so offsets would drift
+    match = re.search(re.escape(section_id), page_text, re.IGNORECASE)
+    return match.start() if match else -1
+
 def _extract_section_content(
     text_pages: List[str], 
+    upper_pages: Dict[int, str], 
     section: Dict[str, Any], 
     next_section: Optional[Dict[str, Any]]
 ) -> str:
@@ -127,54 +344,83 @@ def _extract_section_content(
     
     # Process start page (find section heading)
     page_text = text_pages[start_page]
-    header_pattern = re.escape(section["section_id"])
-    header_match = re.search(header_pattern, page_text, re.IGNORECASE)
+    header_pos = _find_section_id(text_pages, upper_pages, start_page, section)
     
-    if header_match:
-        start_pos = header_match.end()
-        content_parts.append(page_text[start_pos:].strip())
+    if header_pos != -1:
+        start_pos = header_pos + len(section["section_id"])
+        content_parts.append(page_text[start_pos:])
     else:
-        content_parts.append(page_text.strip())
+        content_parts.append(page_text)
     
     # Process middle pages
-    for page_num in range(start_page + 1, end_page):
-        content_parts.append(text_pages[page_num].strip())
+    content_parts.extend(text_pages[start_page + 1:end_page])
     
     # Process end page (stop before next section heading)
     if next_section and end_page < len(text_pages):
         end_page_text = text_pages[end_page]
-        next_header_pattern = re.escape(next_section["section_id"])
-        next_header_match = re.search(next_header_pattern, end_page_text, re.IGNORECASE)
+        next_header_pos = _find_section_id(
+            text_pages, upper_pages, end_page, next_section
+        )
         
-        if next_header_match:
-            end_pos = next_header_match.start()
-            content_parts.append(end_page_text[:end_pos].strip())
+        if next_header_pos != -1:
+            content_parts.append(end_page_text[:next_header_pos])
         else:
-            content_parts.append(end_page_text.strip())
+            content_parts.append(end_page_text)
     
-    return " ".join(content_parts).strip()
+    # Strip each raw part exactly once while joining
+    return " ".join(part.strip() for part in content_parts).strip()
 
 def parse_document_sections(
     text_pages: List[str], 
     toc_entries: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
-    """Extract content for all sections based on TOC information."""
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each section with its content, extracted based on TOC information.
+    
+    toc_entries must be ordered by page, which build_toc_entries guarantees
+    since it scans pages in order. The function takes ownership of text_pages:
+    each page is replaced with "" once no remaining section can reach it, so
+    its text can be freed, and callers must not reuse the list afterwards.
+    """
     print("📑 Parsing document sections...")
-    parsed_sections = []
+    parsed_count = 0
     
-    # Sort TOC entries by page number for sequential processing
-    sorted_toc = sorted(toc_entries, key=lambda x: x["page"])
+    # Upper-cased pages for case-insensitive heading lookups, built on demand
+    upper_pages: Dict[int, str] = {}
+    freed_upto = 0
     
-    for i, section in enumerate(sorted_toc):
-        next_section = sorted_toc[i + 1] if i + 1 < len(sorted_toc) else None
-        content = _extract_section_content(text_pages, section, next_section)
+    for i, section in enumerate(toc_entries):
+        next_section = toc_entries[i + 1] if i + 1 < len(toc_entries) else None
+        content = _extract_section_content(
+            text_pages, upper_pages, section, next_section
+        )
+        
+        # TOC entries are saved separately, so build a new dict rather than mutating
+        yield {**section, "content": content}
+        parsed_count += 1
         
-        section_with_content = section.copy()
-        section_with_content["content"] = content
-        parsed_sections.append(section_with_content)
+        # Later sections start at or after the next section's page; drop earlier pages
+        if next_section:
+            next_start = max(0, min(next_section["page"] - 1, len(text_pages) - 1))
+            for page_num in range(freed_upto, next_start):
+                text_pages[page_num] = ""
+                upper_pages.pop(page_num, None)
+            freed_upto = max(freed_upto, next_start)
     
-    print(f"Parsed content for {len(parsed_sections)} sections.")
-    return parsed_sections
+    print(f"Parsed content for {parsed_count} sections.")
+
+def _collect_summaries(
+    sections: Iterable[Dict[str, Any]], 
+    summaries: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Pass sections through while recording the fields the validation report needs."""
+    for section in sections:
+        summaries.append({
+            "section_id": section["section_id"],
+            "title": section["title"],
+            "page": section["page"]
+        })
+        yield section
 
 def generate_validation_report(
     toc_entries: List[Dict[str, Any]], 
@@ -186,82 +432,129 @@ def generate_validation_report(
     # Handle empty TOC scenario
     if not toc_entries:
         print("⚠️ No Table of Contents entries found. Creating empty validation report.")
-        report_path = os.path.join(OUTPUT_DIR, "validation_report_fixed.xlsx")
         
         # Create empty report
-        with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-            pd.DataFrame([["No TOC entries found"]], columns=["Status"]).to_excel(
-                writer, sheet_name="Summary", index=False
-            )
-            pd.DataFrame([], columns=["section_id", "title", "page"]).to_excel(
-                writer, sheet_name="Detailed Comparison", index=False
-            )
+        summary_path, comparison_path = _write_validation_report(
+            [["Status", "No TOC entries found"]], []
+        )
         
-        print(f"✅ Empty validation report saved to {report_path}")
+        print(f"✅ Empty validation report saved to {summary_path} and {comparison_path}")
         return
     
-    # Create DataFrames for comparison
-    toc_df = pd.DataFrame(toc_entries)[["section_id", "title", "page"]]
-    parsed_df = pd.DataFrame(parsed_sections)[["section_id", "title", "page"]]
-    
-    # Merge for comparison
-    comparison_df = pd.merge(
-        toc_df, 
-        parsed_df, 
-        on="section_id", 
-        how="outer", 
-        suffixes=("_toc", "_parsed")
-    )
+    # Join TOC and parsed sections on section_id using plain set/dict lookups
+    toc_ids = {entry["section_id"] for entry in toc_entries}
+    parsed_ids = {section["section_id"] for section in parsed_sections}
+    toc_only_ids = toc_ids - parsed_ids
+    parsed_only_ids = parsed_ids - toc_ids
+    
+    parsed_by_id = defaultdict(list)
+    for section in parsed_sections:
+        parsed_by_id[section["section_id"]].append(section)
     
-    # Identify mismatches
-    toc_only = comparison_df[comparison_df["title_parsed"].isna()]
-    parsed_only = comparison_df[comparison_df["title_toc"].isna()]
+    matched_rows = []
+    toc_only = []
+    for entry in toc_entries:
+        if entry["section_id"] in toc_only_ids:
+            toc_only.append(entry)
+            continue
+        for section in parsed_by_id[entry["section_id"]]:
+            matched_rows.append((
+                entry["section_id"], entry["title"], entry["page"],
+                section["title"], section["page"]
+            ))
+    parsed_only = [
+        section for section in parsed_sections 
+        if section["section_id"] in parsed_only_ids
+    ]
+    
+    comparison_rows = (
+        matched_rows
+        + [(e["section_id"], e["title"], e["page"], None, None) for e in toc_only]
+        + [(s["section_id"], None, None, s["title"], s["page"]) for s in parsed_only]
+    )
     
     # Create report data
-    report_data = [
-        ["Metric", "Value"],
+    report_data: List[List[Any]] = [
         ["Total Sections in TOC", len(toc_entries)],
         ["Total Sections Parsed", len(parsed_sections)],
-        ["Sections Matched", len(comparison_df.dropna())],
+        ["Sections Matched", len(matched_rows)],
         ["Sections in TOC only", len(toc_only)],
         ["Sections in Parsed only", len(parsed_only)]
     ]
     
     # Add detailed mismatch information
-    if not toc_only.empty:
+    if toc_only:
         report_data.append(["Sections in TOC only:", ""])
-        for _, row in toc_only.iterrows():
+        for entry in toc_only:
             report_data.append([
-                f"{row['section_id']} - {row['title_toc']}", ""
+                f"{entry['section_id']} - {entry['title']}", ""
             ])
     
-    if not parsed_only.empty:
+    if parsed_only:
         report_data.append(["Sections in Parsed only:", ""])
-        for _, row in parsed_only.iterrows():
+        for section in parsed_only:
             report_data.append([
-                f"{row['section_id']} - {row['title_parsed']}", ""
+                f"{section['section_id']} - {section['title']}", ""
             ])
     
-    # Save to Excel
-    report_path = os.path.join(OUTPUT_DIR, "validation_report_fixed.xlsx")
-    with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-        pd.DataFrame(report_data[1:], columns=report_data[0]).to_excel(
-            writer, sheet_name="Summary", index=False
-        )
-        comparison_df.to_excel(
-            writer, sheet_name="Detailed Comparison", index=False
-        )
+    # Save summary and comparison
+    summary_path, comparison_path = _write_validation_report(report_data, comparison_rows)
+    
+    print(f"✅ Validation report saved to {summary_path} and {comparison_path}")
+
+def _write_validation_report(
+    summary_rows: Sequence[Sequence[Any]], 
+    comparison_rows: Iterable[Sequence[Any]]
+) -> Tuple[str, str]:
+    """Write the plain-text summary and the comparison CSV, returning both paths."""
+    summary_path = os.path.join(OUTPUT_DIR, "validation_summary_fixed.txt")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        for label, value in summary_rows:
+            # Rows with no value are headings for the mismatch listings
+            f.write(f"{label}: {value}\n" if value != "" else f"{label}\n")
     
-    print(f"✅ Validation report saved to {report_path}")
+    comparison_path = os.path.join(OUTPUT_DIR, "validation_comparison_fixed.csv")
+    with open(comparison_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COMPARISON_COLUMNS)
+        writer.writerows(comparison_rows)
+    
+    return summary_path, comparison_path
 
-def save_jsonl(data: List[Dict[str, Any]], filename: str) -> None:
-    """Save data to a JSONL file in the output directory."""
+def save_jsonl(data: Iterable[Dict[str, Any]], filename: str) -> None:
+    """Stream data to a JSONL file in the output directory."""
     filepath = os.path.join(OUTPUT_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        for item in data:
-            f.write(json.dumps(item) + "\n")
+    records = iter(data)
+    with open(filepath, "wb") as f:
+        # Encode in batches so each batch is written with a single call
+        while True:
+            batch = b"".join(
+                _encode_jsonl_record(item) 
+                for item in islice(records, JSONL_BATCH_SIZE)
+            )
+            if not batch:
+                break
+            f.write(batch)
     print(f"✅ Saved {filename}")
 
+def _encode_jsonl_record(item: Dict[str, Any]) -> bytes:
+    """Encode one record as a UTF-8 JSON line, skipping internal helper fields."""
+    record = {k: v for k, v in item.items() if not k.startswith("_")}
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass  # e.g. lone surrogates in page text; let the json module escape them
+    
+    # Compact, unescaped UTF-8 matches orjson's output byte for byte
+    try:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        return (line + "\n").encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates have no UTF-8 form, so fall back to \uXXXX escapes
+        line = json.dumps(record, separators=(",", ":"))
+        return (line + "\n").encode("ascii")
+
 def main() -> None:
     """Main execution flow to orchestrate the PDF parsing process."""
     # Create output directory
@@ -276,18 +569,21 @@ def main() -> None:
         doc_title = "Universal Serial Bus Power Delivery Specification, Revision 3.2, Version 1.1, 2024-10"
         
         # Find and parse TOC content
-        toc_lines = find_toc_content(text_pages)
-        toc_entries = parse_toc_entries(toc_lines, doc_title)
-        
-        # Parse document sections
-        parsed_sections = parse_document_sections(text_pages, toc_entries)
-        
-        # Save outputs
+        toc_entries = build_toc_entries(text_pages, doc_title)
         save_jsonl(toc_entries, "usb_pd_toc_fixed.jsonl")
-        save_jsonl(parsed_sections, "usb_pd_spec_fixed.jsonl")
+        
+        # Parse document sections, writing each one out as soon as it is extracted.
+        # text_pages is handed over here; consumed pages are released as we go.
+        section_summaries: List[Dict[str, Any]] = []
+        save_jsonl(
+            _collect_summaries(
+                parse_document_sections(text_pages, toc_entries), section_summaries
+            ),
+            "usb_pd_spec_fixed.jsonl"
+        )
         
         # Generate validation report
-        generate_validation_report(toc_entries, parsed_sections)
+        generate_validation_report(toc_entries, section_summaries)
         
     except Exception as e:
         print(f"❌ Error during processing: {str(e)}")